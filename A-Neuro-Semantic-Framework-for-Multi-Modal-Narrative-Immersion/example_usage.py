@@ -57,7 +57,7 @@ def main():
     print(f"   Label: {sentiment['label']}")
     print(f"   Confidence: {sentiment['score']:.2f}")
     print(f"   Emotions:")
-    for emotion, score in sentiment['emotions'].items():
+    for emotion, score in sentiment['emotions']._asdict().items():
         if score > 0:
             print(f"      - {emotion}: {score:.2f}")
     
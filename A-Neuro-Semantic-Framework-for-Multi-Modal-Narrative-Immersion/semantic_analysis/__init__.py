@@ -7,20 +7,52 @@ This module provides NLP-based semantic analysis capabilities including:
 - Tone and mood detection
 - Character relationship extraction
 - Story background and context analysis
+- Dialogue extraction and conversation analysis
+- Named entity recognition
+- Knowledge graph construction
+- Language detection and multilingual analysis
+- Timeline tracking and temporal structure analysis
 """
 
-from .semantic_analyzer import SemanticAnalyzer
-from .sentiment_analyzer import SentimentAnalyzer
-from .tone_analyzer import ToneAnalyzer
-from .relationship_extractor import RelationshipExtractor
-from .context_analyzer import ContextAnalyzer
-
-__all__ = [
-    'SemanticAnalyzer',
-    'SentimentAnalyzer',
-    'ToneAnalyzer',
-    'RelationshipExtractor',
-    'ContextAnalyzer'
-]
-
-__version__ = '1.0.0'
+import importlib
+
+# Public name -> defining submodule, resolved on first attribute access
+# (PEP 562). Importing the package stays cheap for callers that only
+# need one analyzer; SentimentAnalyzer in particular may pull in
+# transformers when instantiated.
+_LAZY_IMPORTS = {
+    'SemanticAnalyzer': '.semantic_analyzer',
+    'SentimentAnalyzer': '.sentiment_analyzer',
+    'ToneAnalyzer': '.tone_analyzer',
+    'RelationshipExtractor': '.relationship_extractor',
+    'ContextAnalyzer': '.context_analyzer',
+    'DialogueAnalyzer': '.dialogue_analyzer',
+    'EntityRecognizer': '.entity_recognizer',
+    'NamedEntity': '.entity_recognizer',
+    'KnowledgeGraphBuilder': '.knowledge_graph',
+    'Entity': '.knowledge_graph',
+    'Relation': '.knowledge_graph',
+    'LanguageDetector': '.language_detector',
+    'MultilingualAnalyzer': '.language_detector',
+    'TimelineTracker': '.timeline_tracker',
+    'TimelineEvent': '.timeline_tracker'
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+__version__ = '1.5.0'
+
+
+def __getattr__(name):
+    """Resolve public analyzer classes lazily on first access."""
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    """Include the lazily loaded names in dir() output."""
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
@@ -0,0 +1,78 @@
+"""
+Internal content-hash memoization helper shared by the analyzers.
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable
+import hashlib
+import threading
+
+# Sentinel distinguishing "absent" from a cached None result
+_MISSING = object()
+
+
+class TextResultCache:
+    """
+    Small LRU cache keyed by a fast content hash of the input text.
+
+    Keying on a blake2b digest instead of the text itself keeps large
+    inputs from being pinned in memory by the cache; blake2b is also
+    considerably faster than SHA-256 on typical narrative inputs.
+
+    The analyzers call into these caches from thread pools, so lookups
+    and inserts are guarded by a lock. Cached results are shared
+    between hits, not copied: callers must treat them as read-only.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of results to retain
+        """
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(text: str) -> str:
+        """
+        Compute the cache key for a text.
+
+        Args:
+            text: Input text
+
+        Returns:
+            Hex digest used as the cache key
+        """
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+    def get_or_compute(self, text: str, compute: Callable[[str], Any]) -> Any:
+        """
+        Return the cached result for a text, computing it on a miss.
+
+        Args:
+            text: Input text
+            compute: Callable producing the result for a cache miss
+
+        Returns:
+            Cached or freshly computed result; shared with other
+            callers, so it must not be mutated
+        """
+        key = self.key_for(text)
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING:
+                self._entries.move_to_end(key)
+                return entry
+
+        # Compute outside the lock so concurrent misses on different
+        # texts do not serialize; racing misses on the same text just
+        # compute twice and the last insert wins
+        result = compute(text)
+        with self._lock:
+            self._entries[key] = result
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return result
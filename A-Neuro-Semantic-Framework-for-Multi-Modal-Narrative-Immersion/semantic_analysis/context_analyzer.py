@@ -2,24 +2,34 @@
 Context and story background analysis module.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import os
+import re
+
+from ._cache import TextResultCache
 
 
 class ContextAnalyzer:
     """
     Analyzes story context, setting, and background information.
-    
+
     Extracts temporal, spatial, and thematic context from narrative text.
     """
-    
+
     def __init__(self):
         """Initialize the context analyzer."""
         self.context_patterns = self._initialize_patterns()
-    
-    def _initialize_patterns(self) -> Dict[str, List[str]]:
+        self._keyword_buckets = self._build_keyword_buckets()
+        self._keyword_re = self._build_keyword_regex()
+        self._automaton = self._build_automaton()
+        self._result_cache = TextResultCache()
+
+    def _initialize_patterns(self) -> Dict[str, Dict[str, List[str]]]:
         """
         Initialize context detection patterns.
-        
+
         Returns:
             Dictionary mapping context types to keywords
         """
@@ -41,16 +51,101 @@ class ContextAnalyzer:
                 'romance': ['love', 'romance', 'heart', 'passion', 'affection'],
                 'conflict': ['war', 'battle', 'fight', 'conflict', 'struggle'],
                 'growth': ['learn', 'grow', 'develop', 'change', 'transform']
+            },
+            'flags': {
+                'historical': ['century', 'ancient', 'medieval', 'historical', 'era', 'dynasty'],
+                'futuristic': ['future', 'technology', 'robot', 'space', 'cyber', 'virtual']
             }
         }
-    
+
+    def _build_keyword_buckets(self) -> Dict[str, List[Tuple[str, str]]]:
+        """
+        Flatten the nested pattern dictionary into a keyword lookup table.
+
+        Returns:
+            Dictionary mapping each keyword to its (category, label) buckets
+        """
+        buckets = {}
+        for category, labels in self.context_patterns.items():
+            for label, keywords in labels.items():
+                for keyword in keywords:
+                    buckets.setdefault(keyword.lower(), []).append((category, label))
+        return buckets
+
+    def _build_keyword_regex(self):
+        """
+        Compile a single word-boundary alternation over all keywords.
+
+        Matching whole words avoids false positives such as "war" inside
+        "warning" or "love" inside "clover".
+
+        Returns:
+            Compiled regex pattern matching any keyword
+        """
+        # Longer keywords first so alternation prefers the longest match
+        keywords = sorted(self._keyword_buckets, key=len, reverse=True)
+        return re.compile(r'\b(?:' + '|'.join(re.escape(k) for k in keywords) + r')\b')
+
+    def _build_automaton(self):
+        """
+        Build an Aho-Corasick automaton covering every keyword, if available.
+
+        Returns:
+            Compiled automaton, or None when pyahocorasick is not installed
+        """
+        try:
+            import ahocorasick
+        except ImportError:
+            # Fallback to per-keyword substring scanning if pyahocorasick not available
+            return None
+
+        automaton = ahocorasick.Automaton()
+        for keyword in self._keyword_buckets:
+            automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+        return automaton
+
+    def _scan_keywords(self, text_lower: str) -> Dict[str, int]:
+        """
+        Count keyword occurrences in a single pass over the text.
+
+        Args:
+            text_lower: Input text, already lowercased by the caller
+
+        Returns:
+            Dictionary mapping matched keywords to occurrence counts
+        """
+        if self._automaton is not None:
+            # One linear pass over the text for all keywords; hot names are
+            # bound to locals so the inner loop avoids repeated attribute
+            # lookups and interpreter dispatch
+            counts = {}
+            counts_get = counts.get
+            is_bounded = self._is_word_bounded
+            for end_index, keyword in self._automaton.iter(text_lower):
+                start_index = end_index - len(keyword) + 1
+                if is_bounded(text_lower, start_index, end_index):
+                    counts[keyword] = counts_get(keyword, 0) + 1
+            return counts
+
+        return Counter(self._keyword_re.findall(text_lower))
+
+    @staticmethod
+    def _is_word_bounded(text_lower: str, start_index: int, end_index: int) -> bool:
+        """Check that a match is not embedded inside a longer word."""
+        if start_index > 0 and text_lower[start_index - 1].isalnum():
+            return False
+        if end_index + 1 < len(text_lower) and text_lower[end_index + 1].isalnum():
+            return False
+        return True
+
     def analyze(self, text: str) -> Dict[str, Any]:
         """
         Analyze context and background of the narrative.
-        
+
         Args:
             text: Input narrative text
-            
+
         Returns:
             Dictionary containing:
             - temporal_context: Time period/setting
@@ -58,135 +153,182 @@ class ContextAnalyzer:
             - themes: Detected narrative themes
             - setting_description: Overall setting summary
         """
-        temporal = self._detect_temporal_context(text)
-        spatial = self._detect_spatial_context(text)
-        themes = self._detect_themes(text)
-        
+        return self._result_cache.get_or_compute(text, self._analyze_uncached)
+
+    def analyze_scores(self, text: str) -> Dict[str, Any]:
+        """
+        Analyze context without generating the setting description.
+
+        Fast path for programmatic consumers that only need the
+        structured scores and would otherwise pay for the extra max()
+        calls and string formatting behind `setting_description`.
+
+        Args:
+            text: Input narrative text
+
+        Returns:
+            Dictionary with temporal_context, spatial_context and themes
+        """
+        # Lowercase once; every downstream pass reuses the same copy
+        bucket_scores = self._score_buckets(self._scan_keywords(text.lower()))
+
         return {
-            'temporal_context': temporal,
-            'spatial_context': spatial,
-            'themes': themes,
-            'setting_description': self._generate_setting_description(temporal, spatial, themes)
+            'temporal_context': self._detect_temporal_context(bucket_scores),
+            'spatial_context': self._detect_spatial_context(bucket_scores),
+            'themes': self._detect_themes(bucket_scores)
         }
-    
-    def _detect_temporal_context(self, text: str) -> Dict[str, Any]:
+
+    def _analyze_uncached(self, text: str) -> Dict[str, Any]:
+        """Run the full analysis for a cache miss."""
+        scored = self.analyze_scores(text)
+
+        return {
+            **scored,
+            'setting_description': self._generate_setting_description(
+                scored['temporal_context'], scored['spatial_context'], scored['themes']
+            )
+        }
+
+    def _score_buckets(self, keyword_counts: Dict[str, int]) -> Dict[str, Dict[str, int]]:
+        """
+        Aggregate keyword hits into per-category bucket scores.
+
+        Args:
+            keyword_counts: Keyword occurrence counts from the scan pass
+
+        Returns:
+            Nested dictionary mapping category -> label -> distinct keyword hits
+        """
+        return {
+            category: {
+                label: sum(1 for keyword in keywords if keyword_counts.get(keyword))
+                for label, keywords in labels.items()
+            }
+            for category, labels in self.context_patterns.items()
+        }
+
+    @staticmethod
+    def _primary_label(scores: Dict[str, int]) -> str:
+        """
+        Return the highest-scoring label, or 'unspecified' when all are zero.
+
+        Counter.most_common does the selection in one C-level pass and
+        yields the winning count at the same time, so no separate any()
+        traversal is needed.
+        """
+        top = Counter(scores).most_common(1)
+        if top and top[0][1] > 0:
+            return top[0][0]
+        return 'unspecified'
+
+    def _detect_temporal_context(self, bucket_scores: Dict[str, Dict[str, int]]) -> Dict[str, Any]:
         """
         Detect temporal context (when the story takes place).
-        
+
         Args:
-            text: Input text
-            
+            bucket_scores: Aggregated bucket scores from the scan pass
+
         Returns:
             Dictionary with temporal information
         """
-        text_lower = text.lower()
-        scores = {}
-        
-        for period, keywords in self.context_patterns['temporal'].items():
-            count = sum(1 for keyword in keywords if keyword in text_lower)
-            scores[period] = count
-        
-        primary_period = max(scores, key=scores.get) if any(scores.values()) else 'unspecified'
-        
+        scores = bucket_scores['temporal']
+
         return {
-            'primary_period': primary_period,
+            'primary_period': self._primary_label(scores),
             'period_scores': scores,
-            'is_historical': self._check_historical(text),
-            'is_futuristic': self._check_futuristic(text)
+            'is_historical': bucket_scores['flags']['historical'] > 0,
+            'is_futuristic': bucket_scores['flags']['futuristic'] > 0
         }
-    
-    def _detect_spatial_context(self, text: str) -> Dict[str, Any]:
+
+    def _detect_spatial_context(self, bucket_scores: Dict[str, Dict[str, int]]) -> Dict[str, Any]:
         """
         Detect spatial context (where the story takes place).
-        
+
         Args:
-            text: Input text
-            
+            bucket_scores: Aggregated bucket scores from the scan pass
+
         Returns:
             Dictionary with spatial information
         """
-        text_lower = text.lower()
-        scores = {}
-        
-        for setting, keywords in self.context_patterns['spatial'].items():
-            count = sum(1 for keyword in keywords if keyword in text_lower)
-            scores[setting] = count
-        
-        primary_setting = max(scores, key=scores.get) if any(scores.values()) else 'unspecified'
-        
+        scores = bucket_scores['spatial']
+
         return {
-            'primary_setting': primary_setting,
+            'primary_setting': self._primary_label(scores),
             'setting_scores': scores
         }
-    
-    def _detect_themes(self, text: str) -> Dict[str, float]:
+
+    def _detect_themes(self, bucket_scores: Dict[str, Dict[str, int]]) -> Dict[str, float]:
         """
         Detect narrative themes.
-        
+
         Args:
-            text: Input text
-            
+            bucket_scores: Aggregated bucket scores from the scan pass
+
         Returns:
             Dictionary mapping themes to confidence scores
         """
-        text_lower = text.lower()
-        theme_scores = {}
-        
-        for theme, keywords in self.context_patterns['themes'].items():
-            if len(keywords) > 0:
-                count = sum(1 for keyword in keywords if keyword in text_lower)
-                theme_scores[theme] = min(count / len(keywords), 1.0)
-        
-        # Filter out themes with zero score
-        return {theme: score for theme, score in theme_scores.items() if score > 0}
-    
-    def _check_historical(self, text: str) -> bool:
-        """Check if the narrative has historical elements."""
-        historical_keywords = ['century', 'ancient', 'medieval', 'historical', 'era', 'dynasty']
-        text_lower = text.lower()
-        return any(keyword in text_lower for keyword in historical_keywords)
-    
-    def _check_futuristic(self, text: str) -> bool:
-        """Check if the narrative has futuristic elements."""
-        futuristic_keywords = ['future', 'technology', 'robot', 'space', 'cyber', 'virtual']
-        text_lower = text.lower()
-        return any(keyword in text_lower for keyword in futuristic_keywords)
-    
+        theme_keywords = self.context_patterns['themes']
+
+        # Normalize by keyword-list size, dropping themes with zero score
+        return {
+            theme: min(count / len(theme_keywords[theme]), 1.0)
+            for theme, count in bucket_scores['themes'].items()
+            if count > 0
+        }
+
+    def analyze_batch(self, texts: List[str], n_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Analyze context for multiple texts using a shared thread pool.
+
+        The compiled patterns are shared across all workers, amortizing
+        setup cost. Small batches of short texts may not benefit because
+        of pool overhead.
+
+        Args:
+            texts: List of texts to analyze
+            n_workers: Worker thread count (defaults to the CPU count)
+
+        Returns:
+            List of analysis results in input order
+        """
+        with ThreadPoolExecutor(max_workers=n_workers or os.cpu_count()) as executor:
+            return list(executor.map(self.analyze, texts))
+
     def _generate_setting_description(
-        self, 
-        temporal: Dict[str, Any], 
+        self,
+        temporal: Dict[str, Any],
         spatial: Dict[str, Any],
         themes: Dict[str, float]
     ) -> str:
         """
         Generate a human-readable setting description.
-        
+
         Args:
             temporal: Temporal context data
             spatial: Spatial context data
             themes: Detected themes
-            
+
         Returns:
             Setting description string
         """
         parts = []
-        
+
         # Temporal description
         period = temporal.get('primary_period', 'unspecified')
         if period != 'unspecified':
             parts.append(f"Set in the {period}")
-        
+
         # Spatial description
         setting = spatial.get('primary_setting', 'unspecified')
         if setting != 'unspecified':
             parts.append(f"in a {setting} environment")
-        
+
         # Themes
         if themes:
-            top_theme = max(themes, key=themes.get)
+            top_theme = Counter(themes).most_common(1)[0][0]
             parts.append(f"with themes of {top_theme}")
-        
+
         if not parts:
             return "Context information limited."
-        
+
         return ", ".join(parts) + "."
@@ -0,0 +1,708 @@
+"""
+Named entity recognition module using rule-based patterns.
+"""
+
+from bisect import bisect_right
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Dict, Any, Iterable, List, Optional, Pattern, Tuple
+import os
+import re
+import sys
+
+from ._cache import TextResultCache
+
+# Whitespace-delimited token matcher; finditer yields the same tokens
+# as str.split() together with their true character offsets
+_TOKEN_RE = re.compile(r'\S+')
+
+
+@dataclass(slots=True)
+class NamedEntity:
+    """
+    A single named entity detected in text.
+
+    Slotted to avoid a per-instance __dict__; extraction can allocate
+    one of these per match on entity-dense texts. `attributes` stays
+    None until a caller actually attaches metadata.
+    """
+    text: str
+    entity_type: str
+    start_pos: int
+    end_pos: int
+    confidence: float
+    context_start: int = -1
+    context_end: int = -1
+    attributes: Optional[Dict[str, Any]] = None
+
+
+class RecognizeResult:
+    """
+    Lazy view over one recognition run.
+
+    Holds the raw entity list and computes the derived views
+    (dictionaries, statistics, summary) only when first accessed, so
+    callers that just iterate entities never pay for the aggregation
+    passes.
+    """
+
+    def __init__(self, recognizer: 'EntityRecognizer', text: str, entities: List[NamedEntity]):
+        self._recognizer = recognizer
+        self.text = text
+        self.entities = entities
+
+    @cached_property
+    def entities_dict(self) -> List[Dict[str, Any]]:
+        """Entities in their public dictionary form."""
+        to_dict = self._recognizer._entity_to_dict
+        return [to_dict(entity, self.text) for entity in self.entities]
+
+    @cached_property
+    def entities_by_type(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Entity dictionaries grouped by entity type."""
+        grouped = {}
+        for entity_dict in self.entities_dict:
+            grouped.setdefault(entity_dict['type'], []).append(entity_dict)
+        return grouped
+
+    @cached_property
+    def statistics(self) -> Dict[str, Any]:
+        """Aggregate entity statistics."""
+        return self._recognizer._calculate_statistics(self.entities)
+
+    @cached_property
+    def summary(self) -> str:
+        """Human-readable recognition summary."""
+        # Reuses the type counts already computed for statistics
+        return self._recognizer._generate_summary(
+            self.entities, self.statistics['type_counts']
+        )
+
+    def as_dict(self, include: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Build the classic dictionary result shape.
+
+        Args:
+            include: Optional view names to materialize; defaults to all
+                of 'entities', 'entities_by_type', 'statistics', 'summary'
+
+        Returns:
+            Dictionary with the requested views
+        """
+        if include is None:
+            include = ('entities', 'entities_by_type', 'statistics', 'summary')
+        views = {
+            'entities': lambda: self.entities_dict,
+            'entities_by_type': lambda: self.entities_by_type,
+            'statistics': lambda: self.statistics,
+            'summary': lambda: self.summary
+        }
+        return {name: views[name]() for name in include}
+
+
+class EntityRecognizer:
+    """
+    Rule-based named entity recognizer for narrative text.
+
+    Detects persons, locations, organizations, dates, and times using
+    pattern matching with contextual confidence scoring. Serves as a
+    lightweight alternative to model-based NER when no trained model
+    is available.
+    """
+
+    def __init__(self, language: str = 'en', cache_size: int = 0):
+        """
+        Initialize the entity recognizer.
+
+        Args:
+            language: Language code for the pattern set ('en' or 'zh')
+            cache_size: Entity lists to memoize by content hash; 0 (the
+                default) disables caching so pipelines processing unique
+                documents pay nothing for it
+        """
+        self.language = language
+        self.entity_patterns = self._initialize_patterns()
+        self._freeze_type_tables()
+        self.gazetteers = self._initialize_gazetteers()
+        self.stop_words = self._initialize_stop_words()
+        self._master_regex, self._group_types = self._build_master_regex()
+        self._gazetteer_re, self._gazetteer_group_types = self._build_gazetteer_regex()
+        self._gazetteer_automaton = self._build_gazetteer_automaton()
+        self._entity_cache = TextResultCache(cache_size) if cache_size > 0 else None
+
+    def _initialize_patterns(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Initialize and compile entity detection patterns.
+
+        The pattern set is specialized for the active language at
+        construction time, so extraction never iterates branches that
+        cannot match the text. Case-insensitive patterns carry inline
+        (?i:...) groups instead of compile-time flags, letting the sets
+        combine into one master alternation without flag branching.
+
+        Returns:
+            Dictionary mapping entity types to pattern configuration
+        """
+        if self.language == 'zh':
+            raw_patterns = self._initialize_patterns_zh()
+        else:
+            raw_patterns = self._initialize_patterns_en()
+
+        for type_info in raw_patterns.values():
+            type_info['patterns'] = [
+                re.compile(pattern) for pattern in type_info['patterns']
+            ]
+        return raw_patterns
+
+    @staticmethod
+    def _initialize_patterns_en() -> Dict[str, Dict[str, Any]]:
+        """
+        English entity pattern set.
+
+        Word atoms use possessive quantifiers (stdlib re since Python
+        3.11): a matched word is never re-segmented during backtracking,
+        which caps the engine's work on adversarial near-miss input.
+        The ORGANIZATION middle-word repetition stays greedy on purpose
+        so it can give back the suffix word ("Stanford University").
+
+        Returns:
+            Dictionary mapping entity types to pattern configuration
+        """
+        return {
+            'PERSON': {
+                'patterns': [
+                    r'\b(?:Mr|Mrs|Ms|Dr|Prof)\.?\s++[A-Z][a-z]++(?:\s++[A-Z][a-z]++)*+',
+                    r'\b[A-Z][a-z]++\s++[A-Z][a-z]+\b'
+                ],
+                'weight': 0.8,
+                'context_words': ['said', 'asked', 'replied', 'met', 'told',
+                                  'person', 'man', 'woman']
+            },
+            'LOCATION': {
+                'patterns': [
+                    r'\b[A-Z][a-z]++\s++(?:City|Street|Avenue|Park|River|'
+                    r'Mountain|Island|Village)\b'
+                ],
+                'weight': 0.7,
+                'context_words': ['in', 'at', 'near', 'from', 'visited',
+                                  'traveled', 'located']
+            },
+            'ORGANIZATION': {
+                'patterns': [
+                    r'\b[A-Z][a-z]++(?:\s+[A-Z][a-z]+)*\s++'
+                    r'(?:Inc\.|Corp\.|Ltd\.|Company|University|Institute|School)'
+                ],
+                'weight': 0.75,
+                'context_words': ['works', 'founded', 'joined', 'company',
+                                  'studied']
+            },
+            'DATE': {
+                'patterns': [
+                    r'\b(?i:January|February|March|April|May|June|July|August|'
+                    r'September|October|November|December)\s+\d{1,2}(?:,\s*\d{4})?\b',
+                    r'\b\d{4}-\d{2}-\d{2}\b',
+                    r'\b(?i:Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday)\b'
+                ],
+                'weight': 0.9,
+                'context_words': ['on', 'during', 'since', 'until', 'before']
+            },
+            'TIME': {
+                'patterns': [
+                    r'\b\d{1,2}:\d{2}(?:\s*(?i:[ap]\.?m\.?))?\b',
+                    r'\b(?i:morning|afternoon|evening|night|noon|midnight)\b'
+                ],
+                'weight': 0.85,
+                'context_words': ['at', 'around', 'by', 'every']
+            }
+        }
+
+    @staticmethod
+    def _initialize_patterns_zh() -> Dict[str, Dict[str, Any]]:
+        """
+        Chinese entity pattern set.
+
+        Returns:
+            Dictionary mapping entity types to pattern configuration
+        """
+        return {
+            'PERSON': {
+                'patterns': [
+                    r'[一-鿿]{1,3}(?:先生|小姐|女士|博士|教授|老師)'
+                ],
+                'weight': 0.8,
+                'context_words': ['說', '問', '回答', '遇到', '告訴']
+            },
+            'LOCATION': {
+                'patterns': [
+                    r'[一-鿿]+(?:市|省|縣|鎮|區|街|路|公園|山|島|村)'
+                ],
+                'weight': 0.7,
+                'context_words': ['在', '到', '附近', '來自', '位於']
+            },
+            'ORGANIZATION': {
+                'patterns': [
+                    r'[一-鿿]+(?:公司|大學|學院|學校|機構|協會)'
+                ],
+                'weight': 0.75,
+                'context_words': ['工作', '成立', '加入', '就讀']
+            },
+            'DATE': {
+                'patterns': [
+                    r'\d{4}年\d{1,2}月\d{1,2}日',
+                    r'\d{1,2}月\d{1,2}日',
+                    r'星期[一二三四五六日天]'
+                ],
+                'weight': 0.9,
+                'context_words': ['在', '於', '自從', '直到']
+            },
+            'TIME': {
+                'patterns': [
+                    r'\d{1,2}[點时時]\d{0,2}分?',
+                    r'(?:早上|上午|中午|下午|傍晚|晚上|半夜|凌晨)'
+                ],
+                'weight': 0.85,
+                'context_words': ['在', '大約', '每']
+            }
+        }
+
+    def _freeze_type_tables(self) -> None:
+        """
+        Freeze per-type configuration into parallel tuples.
+
+        Confidence scoring indexes these by integer type id instead of
+        doing two dict .get calls (with default construction) per
+        detected entity.
+        """
+        self._type_names = tuple(self.entity_patterns)
+        self._type_index = {name: index for index, name in enumerate(self._type_names)}
+        self._type_weights = tuple(
+            type_info['weight'] for type_info in self.entity_patterns.values()
+        )
+        self._type_context_words = tuple(
+            tuple(word.lower() for word in type_info['context_words'])
+            for type_info in self.entity_patterns.values()
+        )
+        # Bytes twins of the context words, used when the input is pure
+        # ASCII: bytes.find dispatches to the C memmem routine, which is
+        # faster than str containment on short needles
+        self._type_context_words_bytes = tuple(
+            tuple(word.encode('utf-8') for word in words)
+            for words in self._type_context_words
+        )
+
+    def _build_master_regex(self) -> Tuple[Pattern, Dict[str, int]]:
+        """
+        Fuse every entity pattern into one alternation with named groups.
+
+        A single finditer pass then replaces one full text scan per
+        pattern. Case-insensitivity is expressed inline in the pattern
+        sources, so branches combine without any flag reconciliation.
+
+        Returns:
+            Tuple of (compiled master pattern, group name -> type id)
+        """
+        # At equal start positions the alternation takes the first
+        # matching branch, so the generic capitalized-name pattern
+        # (PERSON) goes last: suffix-anchored types must get first
+        # claim on spans like "Stanford University" or "London City"
+        ordered = sorted(
+            self.entity_patterns.items(),
+            key=lambda item: item[0] == 'PERSON'
+        )
+        branches = []
+        group_types = {}
+        for entity_type, type_info in ordered:
+            for pattern in type_info['patterns']:
+                group_name = f'g{len(group_types)}'
+                branches.append(f'(?P<{group_name}>{pattern.pattern})')
+                group_types[group_name] = self._type_index[entity_type]
+        return re.compile('|'.join(branches)), group_types
+
+    def _initialize_gazetteers(self) -> Dict[str, Tuple[str, ...]]:
+        """
+        Initialize literal name lists scanned outside the regex engine.
+
+        Keeping word lists out of regex alternations lets them grow
+        without inflating the compiled pattern.
+
+        Returns:
+            Dictionary mapping entity types to known-name tuples
+        """
+        return {
+            'LOCATION': ('America', 'Europe', 'Asia', 'Africa', 'London', 'Paris',
+                         'Tokyo', 'Beijing', 'Taipei', 'Tainan', 'Kaohsiung')
+        }
+
+    def _build_gazetteer_regex(self) -> Tuple[Pattern, Dict[str, str]]:
+        """
+        Compile the gazetteer fallback pattern.
+
+        Used when pyahocorasick is not installed; still scans all names
+        in one pass per text.
+
+        Returns:
+            Tuple of (compiled pattern, group name -> type id)
+        """
+        branches = []
+        group_types = {}
+        for entity_type, names in self.gazetteers.items():
+            group_name = f'z{len(group_types)}'
+            alternation = '|'.join(re.escape(name) for name in names)
+            branches.append(rf'(?P<{group_name}>\b(?:{alternation})\b)')
+            group_types[group_name] = self._type_index[entity_type]
+        return re.compile('|'.join(branches)), group_types
+
+    def _build_gazetteer_automaton(self):
+        """
+        Build an Aho-Corasick automaton over the gazetteers, if available.
+
+        Returns:
+            Compiled automaton, or None when pyahocorasick is not installed
+        """
+        try:
+            import ahocorasick
+        except ImportError:
+            # Fallback to the compiled alternation if pyahocorasick not available
+            return None
+
+        automaton = ahocorasick.Automaton()
+        for entity_type, names in self.gazetteers.items():
+            type_index = self._type_index[entity_type]
+            for name in names:
+                automaton.add_word(name, (type_index, name))
+        automaton.make_automaton()
+        return automaton
+
+    def _scan_gazetteers(self, text: str) -> List[Tuple[int, int, int, str]]:
+        """
+        Find all gazetteer hits in a single linear pass.
+
+        Args:
+            text: Input narrative text
+
+        Returns:
+            List of (start, end, type id, matched text) tuples
+        """
+        hits = []
+
+        if self._gazetteer_automaton is not None:
+            for end_index, (type_index, name) in self._gazetteer_automaton.iter(text):
+                start_index = end_index - len(name) + 1
+                if start_index > 0 and text[start_index - 1].isalnum():
+                    continue
+                if end_index + 1 < len(text) and text[end_index + 1].isalnum():
+                    continue
+                hits.append((start_index, end_index + 1, type_index, name))
+            return hits
+
+        for match in self._gazetteer_re.finditer(text):
+            type_index = self._gazetteer_group_types[match.lastgroup]
+            hits.append((match.start(), match.end(), type_index, match.group()))
+        return hits
+
+    def _initialize_stop_words(self) -> frozenset:
+        """
+        Initialize words that should never become entities.
+
+        Returns:
+            Frozen set of stop words
+        """
+        # Interned so identity comparison short-circuits most lookups
+        return frozenset(sys.intern(word) for word in {
+            'The End', 'New Year', 'Good Morning', 'Good Night',
+            'Thank You', 'Once Upon'
+        })
+
+    def recognize(self, text: str) -> Dict[str, Any]:
+        """
+        Recognize named entities in the given text.
+
+        Args:
+            text: Input narrative text
+
+        Returns:
+            Dictionary containing:
+            - entities: List of detected entities
+            - entities_by_type: Entities grouped by type
+            - statistics: Aggregate entity statistics
+            - summary: Human-readable recognition summary
+        """
+        return self.recognize_lazy(text).as_dict()
+
+    def recognize_lazy(self, text: str) -> RecognizeResult:
+        """
+        Recognize named entities, deferring the derived views.
+
+        Args:
+            text: Input narrative text
+
+        Returns:
+            RecognizeResult whose grouped/statistics/summary views are
+            computed on first access
+        """
+        if self._entity_cache is not None:
+            # Only the entity list is cached; the dict views are cheap
+            # to regenerate and would otherwise pin the original text
+            entities = self._entity_cache.get_or_compute(text, self.extract_entities)
+        else:
+            entities = self.extract_entities(text)
+        return RecognizeResult(self, text, entities)
+
+    def extract_entities(self, text: str) -> List[NamedEntity]:
+        """
+        Extract named entities from text.
+
+        Args:
+            text: Input narrative text
+
+        Returns:
+            List of NamedEntity objects sorted by position
+        """
+        # One linear regex pass plus one gazetteer pass; the merged
+        # candidates are swept in priority order (heaviest type first,
+        # longest span on ties) so a strong DATE hit is never shadowed
+        # by a weaker overlapping candidate that merely starts earlier
+        type_weights = self._type_weights
+        candidates = [
+            (match.start(), match.end(), self._group_types[match.lastgroup], match.group())
+            for match in self._master_regex.finditer(text)
+        ]
+        candidates.extend(self._scan_gazetteers(text))
+        candidates.sort(
+            key=lambda candidate: (
+                -type_weights[candidate[2]], candidate[0] - candidate[1], candidate[0]
+            )
+        )
+
+        # Lowercase once; every confidence computation searches this
+        # shared buffer with bounded find() instead of re-lowering its
+        # own overlapping context slice. For pure-ASCII text the buffer
+        # is encoded to bytes (offsets stay aligned) so the searches run
+        # through C memmem rather than str containment.
+        text_lower = text.lower()
+        if text.isascii():
+            haystack = text_lower.encode('utf-8')
+            context_words_table = self._type_context_words_bytes
+        else:
+            haystack = text_lower
+            context_words_table = self._type_context_words
+
+        # Accepted spans are kept as parallel sorted start/end lists;
+        # each candidate checks its neighbours via bisect in O(log K)
+        entities = []
+        accepted_starts = []
+        accepted_ends = []
+        is_stop_word = self.stop_words.__contains__
+        type_names = self._type_names
+        for start, end, type_index, matched_text in candidates:
+            entity_text = matched_text.strip()
+            if is_stop_word(entity_text):
+                continue
+            slot = bisect_right(accepted_starts, start)
+            if slot > 0 and accepted_ends[slot - 1] > start:
+                continue
+            if slot < len(accepted_starts) and accepted_starts[slot] < end:
+                continue
+            accepted_starts.insert(slot, start)
+            accepted_ends.insert(slot, end)
+
+            context_start, context_end = self._context_bounds(len(text), start, end)
+            entities.append(NamedEntity(
+                text=entity_text,
+                entity_type=type_names[type_index],
+                start_pos=start,
+                end_pos=end,
+                confidence=self._calculate_confidence(
+                    type_index, haystack, context_start, context_end,
+                    context_words_table
+                ),
+                context_start=context_start,
+                context_end=context_end
+            ))
+
+        entities.sort(key=lambda entity: entity.start_pos)
+        return entities
+
+    @staticmethod
+    def _context_bounds(text_length: int, start: int, end: int, window: int = 50) -> Tuple[int, int]:
+        """
+        Compute the context window bounds around an entity.
+
+        Storing bounds instead of a substring avoids copying ~100 chars
+        per hit; the string is only materialized when a caller asks for
+        the dict form of an entity.
+
+        Args:
+            text_length: Length of the input text
+            start: Entity start position
+            end: Entity end position
+            window: Characters of context on each side
+
+        Returns:
+            (context start, context end) bounds
+        """
+        return max(0, start - window), min(text_length, end + window)
+
+    def _calculate_confidence(
+        self,
+        type_index: int,
+        haystack: Any,
+        context_start: int,
+        context_end: int,
+        context_words_table: Tuple[Tuple[Any, ...], ...]
+    ) -> float:
+        """
+        Score an entity by its type weight plus context-word support.
+
+        Indexes the frozen per-type tables instead of dict lookups, and
+        searches the caller's shared lowercased buffer with bounded
+        find(), so no per-entity slice or lower() is allocated. The
+        buffer and word table are either both str or both bytes.
+
+        Args:
+            type_index: Integer id of the entity type
+            haystack: Lowercased input text, shared across all entities
+            context_start: Context window start
+            context_end: Context window end
+            context_words_table: Per-type context words matching the
+                haystack's type
+
+        Returns:
+            Confidence score between 0.0 and 1.0
+        """
+        find = haystack.find
+        supporting = sum(
+            1 for word in context_words_table[type_index]
+            if find(word, context_start, context_end) != -1
+        )
+        return min(self._type_weights[type_index] + 0.05 * supporting, 1.0)
+
+    def _entity_to_dict(self, entity: NamedEntity, text: str) -> Dict[str, Any]:
+        """
+        Convert a NamedEntity into its public dictionary form.
+
+        Args:
+            entity: Entity to convert
+            text: Input narrative text the entity was found in
+
+        Returns:
+            Dictionary representation of the entity
+        """
+        return {
+            'text': entity.text,
+            'type': entity.entity_type,
+            'start_pos': entity.start_pos,
+            'end_pos': entity.end_pos,
+            'confidence': round(entity.confidence, 3),
+            'context': text[entity.context_start:entity.context_end][:100]
+        }
+
+    def _calculate_statistics(self, entities: List[NamedEntity]) -> Dict[str, Any]:
+        """
+        Calculate aggregate statistics for detected entities.
+
+        Args:
+            entities: Detected entities
+
+        Returns:
+            Dictionary with counts and confidence statistics
+        """
+        # Single pass: Counters for the frequency tables, running sums
+        # for the rest. Tuple keys avoid building and re-splitting
+        # "text_type" strings.
+        type_counts = Counter()
+        entity_counts = Counter()
+        unique_texts = set()
+        total_confidence = 0.0
+        for entity in entities:
+            type_counts[entity.entity_type] += 1
+            entity_counts[(entity.text, entity.entity_type)] += 1
+            unique_texts.add(entity.text)
+            total_confidence += entity.confidence
+
+        return {
+            'total_entities': len(entities),
+            'unique_entities': len(unique_texts),
+            'type_counts': dict(type_counts),
+            'average_confidence': total_confidence / len(entities) if entities else 0.0,
+            'top_entities': [
+                {'entity': entity_text, 'count': count}
+                for (entity_text, _), count in entity_counts.most_common(5)
+            ]
+        }
+
+    def _generate_summary(self, entities: List[NamedEntity], type_counts: Dict[str, int]) -> str:
+        """
+        Generate a human-readable summary of the recognition run.
+
+        Args:
+            entities: Detected entities
+            type_counts: Per-type counts from _calculate_statistics
+
+        Returns:
+            Summary string
+        """
+        if not entities:
+            return "No named entities detected."
+
+        parts = [f"{count} {entity_type.lower()}" for entity_type, count in type_counts.items()]
+        return f"Detected {len(entities)} entities: " + ", ".join(parts) + "."
+
+    def to_iob2(self, text: str, entities: List[NamedEntity]) -> List[Tuple[str, str]]:
+        """
+        Convert entities to IOB2 token tags.
+
+        Args:
+            text: Original input text
+            entities: Entities detected in the text
+
+        Returns:
+            List of (token, tag) pairs in token order
+        """
+        # Map every character position to its token index with a flat
+        # list filled by slice assignment; -1 marks whitespace between
+        # tokens. Offsets come from the token matches themselves, so
+        # runs of whitespace (double spaces, paragraph breaks) cannot
+        # shift the mapping the way a cumulative len+1 walk did.
+        tokens = []
+        char_to_token = [-1] * len(text)
+        for index, match in enumerate(_TOKEN_RE.finditer(text)):
+            tokens.append(match.group())
+            char_to_token[match.start():match.end()] = (
+                [index] * (match.end() - match.start())
+            )
+
+        tags = ['O'] * len(tokens)
+        for entity in entities:
+            start_token = char_to_token[entity.start_pos]
+            end_token = char_to_token[entity.end_pos - 1]
+            if start_token < 0 or end_token < 0:
+                continue
+            tags[start_token] = f'B-{entity.entity_type}'
+            for index in range(start_token + 1, end_token + 1):
+                tags[index] = f'I-{entity.entity_type}'
+
+        return list(zip(tokens, tags))
+
+    def recognize_batch(
+        self, texts: List[str], max_workers: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Recognize entities for multiple texts using a shared thread pool.
+
+        Recognition is independent per document and the regex engine
+        releases the GIL during its C-level scan, so documents overlap
+        well on threads. The recognizer's compiled state is immutable
+        after construction and safe to share across workers.
+
+        Args:
+            texts: List of texts to analyze
+            max_workers: Worker thread count (defaults to the CPU count)
+
+        Returns:
+            List of recognition results in input order
+        """
+        with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            return list(executor.map(self.recognize, texts))
@@ -2,9 +2,13 @@
 Character relationship extraction module.
 """
 
+from bisect import bisect_left, bisect_right
+from collections import Counter
 from typing import Dict, List, Any
 import re
 
+from ._cache import TextResultCache
+
 
 class RelationshipExtractor:
     """
@@ -12,11 +16,80 @@ class RelationshipExtractor:
     
     Identifies characters, their interactions, and the nature of their relationships.
     """
-    
+
+    # Compiled once at class creation; re.findall/re.finditer with a
+    # string pattern pay a cache lookup and, on a cold cache, a full
+    # recompile on every call
+    _CAP_WORD = re.compile(r'\b[A-Z][a-z]+\b')
+
     def __init__(self):
         """Initialize the relationship extractor."""
         self.relationship_patterns = self._initialize_patterns()
-    
+        # Keyword -> relationship types using it ('partner' appears in
+        # both romantic and professional)
+        self._keyword_types = {}
+        for rel_type, keywords in self.relationship_patterns.items():
+            for keyword in keywords:
+                self._keyword_types.setdefault(keyword, []).append(rel_type)
+        self._keyword_automaton = self._build_automaton()
+        # Fallback alternation for when pyahocorasick is unavailable;
+        # longest-first so 'lover' wins over 'love' at the same offset
+        self._keyword_re = re.compile('|'.join(
+            re.escape(keyword)
+            for keyword in sorted(self._keyword_types, key=len, reverse=True)
+        ))
+        # Repeated inputs (re-analyzed chapters, recurring quoted
+        # passages) return in O(1) from the cache
+        self._result_cache = TextResultCache(maxsize=1024)
+
+    def _build_automaton(self):
+        """
+        Build an Aho-Corasick automaton over the relationship keywords.
+
+        One automaton pass finds every keyword occurrence in a single
+        linear walk of the text, replacing one substring scan per
+        keyword.
+
+        Returns:
+            Automaton instance, or None when pyahocorasick is not
+            installed
+        """
+        try:
+            import ahocorasick
+        except ImportError:
+            # Fallback to the fused-alternation scan if pyahocorasick not available
+            return None
+
+        automaton = ahocorasick.Automaton()
+        for keyword in self._keyword_types:
+            automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+        return automaton
+
+    def _find_keyword_hits(self, text_lower):
+        """
+        Locate every relationship keyword occurrence in the text.
+
+        Args:
+            text_lower: Lowercased input text
+
+        Returns:
+            List of (position, relationship type, keyword) tuples
+        """
+        hits = []
+        if self._keyword_automaton is not None:
+            for end, keyword in self._keyword_automaton.iter(text_lower):
+                position = end - len(keyword) + 1
+                for rel_type in self._keyword_types[keyword]:
+                    hits.append((position, rel_type, keyword))
+        else:
+            for match in self._keyword_re.finditer(text_lower):
+                keyword = match.group()
+                for rel_type in self._keyword_types[keyword]:
+                    hits.append((match.start(), rel_type, keyword))
+        return hits
+
+
     def _initialize_patterns(self) -> Dict[str, List[str]]:
         """
         Initialize relationship detection patterns.
@@ -34,13 +107,16 @@ class RelationshipExtractor:
             'mentor': ['teacher', 'mentor', 'guide', 'master', 'instructor']
         }
     
-    def extract(self, text: str) -> Dict[str, Any]:
+    def extract(self, text: str, text_lower: str = None) -> Dict[str, Any]:
         """
         Extract character relationships from text.
-        
+
         Args:
             text: Input narrative text
-            
+            text_lower: Lowercased copy of the text; computed when not
+                supplied, so callers that already lowercased avoid a
+                second copy
+
         Returns:
             Dictionary containing:
             - characters: List of detected character names
@@ -48,15 +124,32 @@ class RelationshipExtractor:
             - relationship_types: Count of each relationship type
             - interaction_summary: Summary of character interactions
         """
+        return self._result_cache.get_or_compute(
+            text, lambda t: self._extract_uncached(t, text_lower)
+        )
+
+    def _extract_uncached(self, text: str, text_lower: str = None) -> Dict[str, Any]:
+        """
+        Run the relationship extraction without consulting the cache.
+
+        Args:
+            text: Input narrative text
+            text_lower: Lowercased copy, computed when not supplied
+
+        Returns:
+            Relationship extraction result dictionary
+        """
         characters = self._extract_characters(text)
-        relationships = self._detect_relationships(text, characters)
+        relationships = self._detect_relationships(text, characters, text_lower)
         relationship_types = self._count_relationship_types(relationships)
         
         return {
             'characters': characters,
             'relationships': relationships,
             'relationship_types': relationship_types,
-            'interaction_summary': self._summarize_interactions(relationships)
+            'interaction_summary': self._summarize_interactions(
+                relationships, relationship_types
+            )
         }
     
     def _extract_characters(self, text: str) -> List[str]:
@@ -71,83 +164,92 @@ class RelationshipExtractor:
         """
         # Simple extraction: capitalized words that appear multiple times
         # In a production system, would use NER (Named Entity Recognition)
-        words = re.findall(r'\b[A-Z][a-z]+\b', text)
-        
-        # Count occurrences
-        character_counts = {}
-        for word in words:
-            if len(word) > 2:  # Filter short words
-                character_counts[word] = character_counts.get(word, 0) + 1
-        
-        # Return names that appear more than once (likely characters)
-        characters = [name for name, count in character_counts.items() if count > 1]
-        return characters[:10]  # Limit to top 10
+        # Counter updates in C and most_common does a heap selection,
+        # replacing the dict.get loop plus filter-and-slice
+        counts = Counter(
+            word for word in self._CAP_WORD.findall(text) if len(word) > 2
+        )
+
+        # Return names that appear more than once (likely characters),
+        # most frequent first, limited to the top 10
+        return [name for name, count in counts.most_common(10) if count > 1]
     
-    def _detect_relationships(self, text: str, characters: List[str]) -> List[Dict[str, Any]]:
+    def _detect_relationships(self, text: str, characters: List[str],
+                              text_lower: str = None) -> List[Dict[str, Any]]:
         """
         Detect relationships between characters.
-        
+
         Args:
             text: Input text
             characters: List of character names
-            
+            text_lower: Lowercased copy, computed when not supplied
+
         Returns:
             List of relationship dictionaries
         """
         relationships = []
-        text_lower = text.lower()
-        
-        # Look for relationship indicators
-        for rel_type, keywords in self.relationship_patterns.items():
-            for keyword in keywords:
-                if keyword in text_lower:
-                    # Find nearby characters
-                    pattern = r'\b[A-Z][a-z]+\b'
-                    matches = list(re.finditer(pattern, text))
-                    keyword_pos = text_lower.find(keyword)
-                    
-                    # Find characters near the relationship keyword
-                    nearby_chars = []
-                    for match in matches:
-                        if abs(match.start() - keyword_pos) < 100:  # Within 100 chars
-                            char_name = match.group()
-                            if char_name in characters:
-                                nearby_chars.append(char_name)
-                    
-                    # Create relationships for nearby character pairs
-                    if len(nearby_chars) >= 2:
-                        relationships.append({
-                            'character1': nearby_chars[0],
-                            'character2': nearby_chars[1],
-                            'type': rel_type,
-                            'indicator': keyword
-                        })
-        
+        if text_lower is None:
+            text_lower = text.lower()
+
+        # One multi-pattern pass over the text yields every keyword
+        # occurrence with its position, instead of one substring scan
+        # (plus a find() rescan) per keyword
+        hits = self._find_keyword_hits(text_lower)
+        if not hits:
+            return relationships
+
+        # One capitalized-word pass shared by every keyword hit; the
+        # starts are sorted by construction, so each hit narrows its
+        # +/-100 char window with two binary searches instead of
+        # re-testing every match
+        char_starts = []
+        char_names = []
+        for match in self._CAP_WORD.finditer(text):
+            char_starts.append(match.start())
+            char_names.append(match.group())
+        character_set = frozenset(characters)
+
+        for keyword_pos, rel_type, keyword in hits:
+            # Find characters near the relationship keyword
+            lo = bisect_left(char_starts, keyword_pos - 99)
+            hi = bisect_right(char_starts, keyword_pos + 99)
+            nearby_chars = [
+                name for name in char_names[lo:hi] if name in character_set
+            ]
+
+            # Create relationships for nearby character pairs
+            if len(nearby_chars) >= 2:
+                relationships.append({
+                    'character1': nearby_chars[0],
+                    'character2': nearby_chars[1],
+                    'type': rel_type,
+                    'indicator': keyword
+                })
+
         return relationships
     
-    def _count_relationship_types(self, relationships: List[Dict[str, Any]]) -> Dict[str, int]:
+    def _count_relationship_types(self, relationships: List[Dict[str, Any]]) -> Counter:
         """
         Count occurrences of each relationship type.
-        
+
         Args:
             relationships: List of detected relationships
-            
+
         Returns:
-            Dictionary mapping relationship types to counts
+            Counter mapping relationship types to counts
         """
-        counts = {}
-        for rel in relationships:
-            rel_type = rel['type']
-            counts[rel_type] = counts.get(rel_type, 0) + 1
-        return counts
+        return Counter(rel['type'] for rel in relationships)
     
-    def _summarize_interactions(self, relationships: List[Dict[str, Any]]) -> str:
+    def _summarize_interactions(self, relationships: List[Dict[str, Any]],
+                                type_counts: Counter) -> str:
         """
         Create a summary of character interactions.
-        
+
         Args:
             relationships: List of detected relationships
-            
+            type_counts: Relationship type counts already computed by
+                the caller, so the list is not re-scanned here
+
         Returns:
             Human-readable summary
         """
@@ -161,10 +263,9 @@ class RelationshipExtractor:
         
         summary = f"Detected {len(unique_chars)} characters with {len(relationships)} relationships. "
         
-        # Most common relationship type
-        type_counts = self._count_relationship_types(relationships)
+        # Most common relationship type via Counter's heap selection
         if type_counts:
-            most_common = max(type_counts, key=type_counts.get)
+            most_common = type_counts.most_common(1)[0][0]
             summary += f"Primary relationship type: {most_common}."
         
         return summary
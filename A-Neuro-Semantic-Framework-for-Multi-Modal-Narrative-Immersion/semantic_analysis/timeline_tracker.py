@@ -0,0 +1,703 @@
+"""
+Timeline tracking module for narrative event ordering.
+"""
+
+from collections import Counter
+from dataclasses import dataclass, fields
+from operator import attrgetter, itemgetter
+from statistics import fmean
+from typing import Dict, Any, List, Tuple
+import heapq
+import re
+
+from ._cache import TextResultCache
+
+# Capitalized-word matcher and the words it should never report as
+# characters; built once at import instead of per _extract_characters
+# call
+_NAME_RE = re.compile(r'\b[A-Z][a-z]+\b')
+_SKIP_WORDS = frozenset({
+    'The', 'This', 'That', 'Then', 'There', 'They',
+    'When', 'Where', 'After', 'Before', 'Finally',
+    'Yesterday', 'Today', 'Tomorrow', 'Monday', 'Next'
+})
+
+# Duration vocabulary for span estimation: one scan per marker against
+# the alternation, with coarser units winning via their priority index
+_DURATION_RE = re.compile(r'year|month|week|day|morning|night|hour')
+_DURATION_PRIORITY = {
+    'year': 0, 'month': 1, 'week': 2,
+    'day': 3, 'morning': 3, 'night': 3, 'hour': 4
+}
+_DURATION_LABELS = ('years', 'months', 'weeks', 'days', 'hours')
+
+# Sentence chunker shared by every _split_into_sentences call; runs of
+# non-terminator characters are one sentence each
+_SENTENCE_RE = re.compile(r'[^.!?]+')
+
+# Mermaid-unsafe characters mapped in one translate() pass instead of
+# one chained replace() copy per character
+_MERMAID_TRANS = str.maketrans({'"': "'", ':': '-'})
+
+
+@dataclass(slots=True)
+class TimelineEvent:
+    """A single event placed on the narrative timeline."""
+    id: str
+    description: str
+    temporal_marker: str
+    event_type: str
+    position_in_text: int
+    relative_order: int
+    characters_involved: List[str]
+    location: str
+    certainty: float
+
+
+# Field schema derived once from the dataclass; the attrgetter reads
+# every attribute in one call when converting events to dictionaries
+_EVENT_FIELDS = tuple(field.name for field in fields(TimelineEvent))
+_EVENT_GETTER = attrgetter(*_EVENT_FIELDS)
+
+
+class TimelineTracker:
+    """
+    Tracks the temporal structure of narrative text.
+
+    Extracts temporal markers and sequence cues, assembles events in
+    narrative order, and summarizes the overall time structure.
+    """
+
+    def __init__(self):
+        """Initialize the timeline tracker."""
+        self.temporal_patterns = self._initialize_temporal_patterns()
+        self.sequence_markers = self._initialize_sequence_markers()
+        self.event_indicators = self._initialize_event_indicators()
+        self.duration_patterns = self._initialize_duration_patterns()
+        # One union pattern so any duration extraction is a single
+        # engine pass over the text
+        self.duration_re = re.compile(
+            '|'.join(f'(?:{pattern})' for pattern in self.duration_patterns),
+            re.IGNORECASE
+        )
+        # One compiled alternation per category: a single finditer pass
+        # finds every marker of that category, instead of one engine
+        # invocation (and cache lookup) per raw pattern string
+        # Flat tuple for the fallback path: one loop per sentence
+        # instead of nested iteration over the dict's value lists
+        self._all_sequence_markers = tuple(
+            marker
+            for markers in self.sequence_markers.values()
+            for marker in markers
+        )
+        self._sequence_automaton = self._build_automaton(
+            marker
+            for markers in self.sequence_markers.values()
+            for marker in markers
+        )
+        self._event_automaton = self._build_event_automaton()
+        self._compiled_temporal = [
+            (
+                category,
+                info['type'],
+                re.compile(
+                    '|'.join(f'(?:{pattern})' for pattern in info['patterns']),
+                    re.IGNORECASE
+                )
+            )
+            for category, info in self.temporal_patterns.items()
+        ]
+        # Structure-analysis marker tuples, resolved once here instead
+        # of rebuilt (and re-looked-up) on every analyze_time_structure
+        self._flashback_markers = tuple(self.sequence_markers.get('flashback', ()))
+        self._future_markers = ('will', 'would', 'going to', 'foreshadow')
+        self._temporal_hyperscan = self._build_temporal_hyperscan()
+        # Repeated analyses of the same text (e.g. re-rendered scenes)
+        # return the memoized result instead of re-running every pass
+        self._result_cache = TextResultCache(maxsize=128)
+
+    def _build_temporal_hyperscan(self):
+        """
+        Compile every temporal pattern into a Hyperscan database.
+
+        Hyperscan matches the whole pattern set caselessly in one
+        SIMD-accelerated pass over the raw bytes, replacing one
+        finditer pass per category and the IGNORECASE case-folding.
+
+        Returns:
+            (database, id-to-(category, type) list) tuple, or None when
+            hyperscan is not installed
+        """
+        try:
+            import hyperscan
+        except ImportError:
+            # Fallback to the per-category compiled alternations
+            return None
+
+        expressions = []
+        id_map = []
+        for category, info in self.temporal_patterns.items():
+            for pattern in info['patterns']:
+                expressions.append(pattern.encode('utf-8'))
+                id_map.append((category, info['type']))
+
+        database = hyperscan.Database()
+        database.compile(
+            expressions=expressions,
+            ids=list(range(len(expressions))),
+            flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SOM_LEFTMOST]
+            * len(expressions)
+        )
+        return database, id_map
+
+    @staticmethod
+    def _build_automaton(words):
+        """
+        Build an Aho-Corasick automaton over a set of keywords.
+
+        One automaton pass finds every keyword in a single linear walk
+        of the sentence, replacing one substring scan per keyword.
+
+        Args:
+            words: Iterable of keywords to index
+
+        Returns:
+            Automaton instance, or None when pyahocorasick is not
+            installed
+        """
+        try:
+            import ahocorasick
+        except ImportError:
+            # Fallback to per-keyword substring scanning if pyahocorasick not available
+            return None
+
+        automaton = ahocorasick.Automaton()
+        for word in words:
+            automaton.add_word(word, word)
+        automaton.make_automaton()
+        return automaton
+
+    def _build_event_automaton(self):
+        """
+        Build an automaton over the event indicators, tagged with
+        their category and its precedence rank.
+
+        Tagging each indicator lets _detect_event_type classify from
+        the match stream directly, without re-probing the category
+        lists afterwards.
+
+        Returns:
+            Automaton instance, or None when pyahocorasick is not
+            installed
+        """
+        try:
+            import ahocorasick
+        except ImportError:
+            # Fallback to per-keyword substring scanning if pyahocorasick not available
+            return None
+
+        automaton = ahocorasick.Automaton()
+        for priority, (event_type, indicators) in enumerate(
+                self.event_indicators.items()):
+            for indicator in indicators:
+                automaton.add_word(indicator, (priority, event_type))
+        automaton.make_automaton()
+        return automaton
+
+    @staticmethod
+    def _initialize_temporal_patterns() -> Dict[str, Dict[str, Any]]:
+        """
+        Initialize temporal marker patterns by category.
+
+        Returns:
+            Dictionary mapping categories to pattern info
+        """
+        return {
+            'past': {
+                'type': 'relative',
+                'patterns': [
+                    r'\byesterday\b',
+                    r'\blast\s+(?:night|week|month|year)\b',
+                    r'\b(?:\w+\s+)?(?:years?|months?|weeks?|days?)\s+ago\b',
+                    r'\bpreviously\b',
+                    r'\bonce upon a time\b',
+                    r'\bin the past\b'
+                ]
+            },
+            'present': {
+                'type': 'relative',
+                'patterns': [
+                    r'\btoday\b',
+                    r'\bnow\b',
+                    r'\bcurrently\b',
+                    r'\bat the moment\b',
+                    r'\bright now\b'
+                ]
+            },
+            'future': {
+                'type': 'relative',
+                'patterns': [
+                    r'\btomorrow\b',
+                    r'\bnext\s+(?:week|month|year)\b',
+                    r'\bsoon\b',
+                    r'\bin the future\b',
+                    r'\bsomeday\b'
+                ]
+            },
+            'time_of_day': {
+                'type': 'absolute',
+                'patterns': [
+                    r'\b\d{1,2}:\d{2}\b',
+                    r'\b(?:noon|midnight|dawn|dusk)\b',
+                    r'\b(?:morning|afternoon|evening|night)\b'
+                ]
+            },
+            'date': {
+                'type': 'absolute',
+                'patterns': [
+                    r'\b(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b',
+                    r'\b(?:january|february|march|april|may|june|july|august'
+                    r'|september|october|november|december)\b',
+                    r'\b(?:1[0-9]|20)\d{2}\b'
+                ]
+            }
+        }
+
+    @staticmethod
+    def _initialize_sequence_markers() -> Dict[str, List[str]]:
+        """
+        Initialize narrative sequence marker keywords.
+
+        Returns:
+            Dictionary mapping sequence roles to marker phrases
+        """
+        return {
+            'beginning': ['first', 'initially', 'at first', 'in the beginning',
+                          'once upon a time'],
+            'continuation': ['then', 'next', 'after that', 'later', 'meanwhile',
+                             'subsequently'],
+            'ending': ['finally', 'at last', 'in the end', 'eventually',
+                       'ultimately'],
+            'flashback': ['remembered', 'recalled', 'thought back', 'had been',
+                          'years earlier']
+        }
+
+    @staticmethod
+    def _initialize_event_indicators() -> Dict[str, Tuple[str, ...]]:
+        """
+        Initialize event type indicator keywords.
+
+        Returns:
+            Dictionary mapping event types to indicator words
+        """
+        # Tuples iterate faster than lists in the per-sentence fallback
+        return {
+            'action': ('ran', 'fought', 'jumped', 'attacked', 'escaped', 'grabbed'),
+            'dialogue': ('said', 'asked', 'replied', 'shouted', 'whispered'),
+            'emotional': ('felt', 'cried', 'laughed', 'feared', 'loved'),
+            'discovery': ('found', 'discovered', 'realized', 'noticed', 'learned'),
+            'travel': ('arrived', 'left', 'traveled', 'returned', 'departed')
+        }
+
+    @staticmethod
+    def _initialize_duration_patterns() -> List[str]:
+        """
+        Initialize duration expression patterns.
+
+        Returns:
+            List of raw pattern strings
+        """
+        return [
+            r'for\s+\d+\s+(?:years?|months?|weeks?|days?|hours?)',
+            r'(?:all|the whole)\s+(?:day|night|morning|year)',
+            r'\d+\s+(?:years?|months?|days?)\s+later'
+        ]
+
+    def analyze(self, text: str) -> Dict[str, Any]:
+        """
+        Analyze the temporal structure of a narrative text.
+
+        Args:
+            text: Input narrative text
+
+        Returns:
+            Dictionary containing:
+            - temporal_markers: Extracted temporal markers
+            - events: Timeline events in narrative order
+            - time_structure: Overall time structure summary
+            - timeline_phases: Events grouped into narrative phases
+            - statistics: Timeline statistics
+        """
+        return self._result_cache.get_or_compute(text, self._analyze_uncached)
+
+    def _analyze_uncached(self, text: str) -> Dict[str, Any]:
+        """
+        Run the full temporal analysis for a cache miss.
+
+        Args:
+            text: Input narrative text
+
+        Returns:
+            Analysis dictionary as documented on analyze()
+        """
+        temporal_markers = self.extract_temporal_markers(text)
+        events = self.extract_events(text, temporal_markers)
+        # Lowercase the full text once for the structure analysis
+        text_lower = text.lower()
+
+        return {
+            'temporal_markers': temporal_markers,
+            'events': [self._event_to_dict(event) for event in events],
+            'time_structure': self.analyze_time_structure(text, events, text_lower),
+            'timeline_phases': self._group_into_phases(events),
+            'statistics': self.calculate_statistics(temporal_markers, events)
+        }
+
+    def extract_temporal_markers(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Extract temporal markers from text.
+
+        Args:
+            text: Input narrative text
+
+        Returns:
+            List of marker dictionaries sorted by position
+        """
+        markers = []
+        # Hyperscan reports byte offsets; only take that path when they
+        # coincide with character offsets, so positions stay comparable
+        # with the character-based sentence spans (and mean the same
+        # thing whether or not hyperscan is installed)
+        if self._temporal_hyperscan is not None and text.isascii():
+            database, id_map = self._temporal_hyperscan
+            data = text.encode('utf-8')
+
+            def on_match(pattern_id, start, end, flags, context):
+                category, marker_type = id_map[pattern_id]
+                markers.append({
+                    'category': category,
+                    'type': marker_type,
+                    'text': data[start:end].decode('utf-8'),
+                    'position': start,
+                    'end_position': end
+                })
+
+            database.scan(data, match_event_handler=on_match)
+            # Hyperscan reports matches in end-offset order, so the
+            # start positions still need one sort
+            markers.sort(key=lambda marker: marker['position'])
+            return markers
+
+        # Each finditer stream is already ascending by position, so a
+        # k-way merge produces the sorted list without re-sorting
+        def marker_stream(category, marker_type, pattern):
+            for match in pattern.finditer(text):
+                yield {
+                    'category': category,
+                    'type': marker_type,
+                    'text': match.group(),
+                    'position': match.start(),
+                    'end_position': match.end()
+                }
+
+        return list(heapq.merge(
+            *(marker_stream(category, marker_type, pattern)
+              for category, marker_type, pattern in self._compiled_temporal),
+            key=itemgetter('position')
+        ))
+
+    def extract_events(self, text: str,
+                       temporal_markers: List[Dict[str, Any]]) -> List[TimelineEvent]:
+        """
+        Extract timeline events from text.
+
+        Args:
+            text: Input narrative text
+            temporal_markers: Markers from extract_temporal_markers
+
+        Returns:
+            List of TimelineEvent objects in narrative order
+        """
+        sentence_spans = self._split_into_sentences(text)
+        events = []
+
+        # The markers arrive sorted by position and the sentence spans
+        # are in text order, so one merge walk assigns each marker to
+        # its containing sentence instead of substring-testing every
+        # marker against every sentence
+        marker_index = 0
+        marker_count = len(temporal_markers)
+
+        for idx, (sentence, start) in enumerate(sentence_spans):
+            end = start + len(sentence)
+            # Lowercase each sentence once; every keyword check below
+            # shares the copy instead of re-lowercasing per helper
+            sentence_lower = sentence.lower()
+
+            while (marker_index < marker_count
+                   and temporal_markers[marker_index]['position'] < start):
+                marker_index += 1
+            sentence_markers = []
+            while (marker_index < marker_count
+                   and temporal_markers[marker_index]['position'] < end):
+                sentence_markers.append(temporal_markers[marker_index])
+                marker_index += 1
+
+            has_sequence = self._has_sequence_marker(sentence_lower)
+            if not sentence_markers and not has_sequence:
+                continue
+
+            certainty = 0.5
+            if sentence_markers:
+                certainty += 0.3
+            if has_sequence:
+                certainty += 0.2
+
+            events.append(TimelineEvent(
+                id=f'event_{len(events)}',
+                description=sentence[:100],
+                temporal_marker=sentence_markers[0]['text'] if sentence_markers else '',
+                event_type=self._detect_event_type(sentence_lower),
+                position_in_text=idx,
+                relative_order=len(events),
+                characters_involved=self._extract_characters(sentence),
+                location=self._detect_location(sentence),
+                certainty=certainty
+            ))
+
+        return events
+
+    def _split_into_sentences(self, text: str) -> List[Any]:
+        """
+        Split text into sentences with their absolute offsets.
+
+        Args:
+            text: Input text
+
+        Returns:
+            List of (sentence, start offset) tuples for non-empty
+            stripped sentences
+        """
+        sentences = []
+        for match in _SENTENCE_RE.finditer(text):
+            raw = match.group()
+            stripped = raw.strip()
+            if stripped:
+                leading = len(raw) - len(raw.lstrip())
+                sentences.append((stripped, match.start() + leading))
+        return sentences
+
+    def _has_sequence_marker(self, sentence_lower: str) -> bool:
+        """
+        Check whether a sentence carries a narrative sequence marker.
+
+        Args:
+            sentence_lower: Sentence, already lowercased by the caller
+
+        Returns:
+            True when any sequence marker is present
+        """
+        if self._sequence_automaton is not None:
+            return next(self._sequence_automaton.iter(sentence_lower), None) is not None
+        return any(marker in sentence_lower for marker in self._all_sequence_markers)
+
+    def _detect_event_type(self, sentence_lower: str) -> str:
+        """
+        Classify the event type of a sentence.
+
+        Args:
+            sentence_lower: Sentence, already lowercased by the caller
+
+        Returns:
+            Event type name, or 'general' when no indicator matches
+        """
+        if self._event_automaton is not None:
+            # One pass over the tagged match stream, keeping the best
+            # precedence seen and stopping outright on a rank-0 hit;
+            # ties resolve to the original insertion-order precedence
+            best = None
+            for _, (priority, event_type) in self._event_automaton.iter(sentence_lower):
+                if best is None or priority < best[0]:
+                    if priority == 0:
+                        return event_type
+                    best = (priority, event_type)
+            return best[1] if best is not None else 'general'
+        for event_type, indicators in self.event_indicators.items():
+            for indicator in indicators:
+                if indicator in sentence_lower:
+                    return event_type
+        return 'general'
+
+    def _extract_characters(self, sentence: str) -> List[str]:
+        """
+        Extract character names mentioned in a sentence.
+
+        Args:
+            sentence: Sentence to scan
+
+        Returns:
+            List of capitalized names
+        """
+        return [
+            name for name in _NAME_RE.findall(sentence)
+            if name not in _SKIP_WORDS
+        ]
+
+    def _detect_location(self, sentence: str) -> str:
+        """
+        Detect a simple location mention in a sentence.
+
+        Args:
+            sentence: Sentence to scan
+
+        Returns:
+            Location word, or an empty string
+        """
+        match = re.search(r'\b(?:in|at)\s+the\s+(\w+)', sentence, re.IGNORECASE)
+        return match.group(1) if match else ''
+
+    def extract_durations(self, text: str) -> List[str]:
+        """
+        Extract explicit duration expressions from text.
+
+        Args:
+            text: Input narrative text
+
+        Returns:
+            List of matched duration phrases in text order
+        """
+        return [match.group() for match in self.duration_re.finditer(text)]
+
+    def _estimate_duration(self, events: List[TimelineEvent]) -> str:
+        """
+        Estimate the overall time span covered by the events.
+
+        Args:
+            events: Timeline events
+
+        Returns:
+            Coarse duration label
+        """
+        # One pass over the markers tracking the coarsest unit seen,
+        # instead of one full scan of the list per unit
+        best = None
+        for event in events:
+            for match in _DURATION_RE.finditer(event.temporal_marker.lower()):
+                priority = _DURATION_PRIORITY[match.group()]
+                if best is None or priority < best:
+                    best = priority
+                    if best == 0:
+                        return _DURATION_LABELS[0]
+        return _DURATION_LABELS[best] if best is not None else 'unspecified'
+
+    def analyze_time_structure(self, text: str, events: List[TimelineEvent],
+                               text_lower: str = None) -> Dict[str, Any]:
+        """
+        Summarize the overall time structure of the narrative.
+
+        Args:
+            text: Input narrative text
+            events: Extracted timeline events
+            text_lower: Lowercased copy, computed when not supplied
+
+        Returns:
+            Dictionary with chronology flags and estimated span
+        """
+        if text_lower is None:
+            text_lower = text.lower()
+
+        has_flashbacks = any(
+            marker in text_lower for marker in self._flashback_markers
+        )
+        has_future_references = any(
+            marker in text_lower for marker in self._future_markers
+        )
+
+        return {
+            'is_chronological': not has_flashbacks,
+            'has_flashbacks': has_flashbacks,
+            'has_future_references': has_future_references,
+            'narrative_style': 'non-linear' if has_flashbacks else 'linear',
+            'estimated_span': self._estimate_duration(events)
+        }
+
+    def _group_into_phases(self, events: List[TimelineEvent]) -> List[Dict[str, Any]]:
+        """
+        Group events into beginning, middle and ending phases.
+
+        Args:
+            events: Timeline events in narrative order
+
+        Returns:
+            List of phase dictionaries with member event ids
+        """
+        # Extract the ids once and slice the list; the attribute walk
+        # no longer runs once per phase comprehension
+        ids = [event.id for event in events]
+        third = max(len(ids) // 3, 1)
+        return [
+            {'phase': 'beginning', 'events': ids[:third]},
+            {'phase': 'middle', 'events': ids[third:2 * third]},
+            {'phase': 'ending', 'events': ids[2 * third:]}
+        ]
+
+    def calculate_statistics(self, temporal_markers: List[Dict[str, Any]],
+                             events: List[TimelineEvent]) -> Dict[str, Any]:
+        """
+        Compute summary statistics for the timeline.
+
+        Args:
+            temporal_markers: Extracted temporal markers
+            events: Extracted timeline events
+
+        Returns:
+            Dictionary with counts and average certainty
+        """
+        # Counter does the tallying in C instead of a dict.get loop
+        marker_types = Counter(marker['category'] for marker in temporal_markers)
+        event_types = Counter(event.event_type for event in events)
+
+        average_certainty = (
+            fmean(event.certainty for event in events) if events else 0.0
+        )
+
+        return {
+            'total_markers': len(temporal_markers),
+            'total_events': len(events),
+            'marker_types': dict(marker_types),
+            'event_types': dict(event_types),
+            'average_certainty': round(average_certainty, 3)
+        }
+
+    def to_mermaid(self, events: List[TimelineEvent]) -> str:
+        """
+        Render events as a Mermaid timeline diagram.
+
+        Args:
+            events: Timeline events in narrative order
+
+        Returns:
+            Mermaid timeline source text
+        """
+        def lines():
+            yield 'timeline'
+            yield '    title Narrative Timeline'
+            for event in events:
+                description = event.description[:40].translate(_MERMAID_TRANS)
+                marker = event.temporal_marker.translate(_MERMAID_TRANS) or 'unmarked'
+                yield f'    {marker} : {description}'
+
+        return '\n'.join(lines())
+
+    @staticmethod
+    def _event_to_dict(event: TimelineEvent) -> Dict[str, Any]:
+        """
+        Convert a TimelineEvent into its dictionary form.
+
+        Args:
+            event: Event to convert
+
+        Returns:
+            Event dictionary
+        """
+        return dict(zip(_EVENT_FIELDS, _EVENT_GETTER(event)))
@@ -2,7 +2,27 @@
 Tone and mood analysis module.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List
+import os
+
+from ._cache import TextResultCache
+
+# Shared keyword constants, built once at import so the per-text
+# methods carry no literal-construction or allocation overhead
+_INTENSITY_MARKERS = (
+    '!', '?', 'very', 'extremely', 'absolutely', 'completely',
+    'totally', 'utterly', 'incredibly', 'amazingly'
+)
+_MOOD_MAPPING = {
+    'dramatic': 'intense',
+    'serious': 'somber',
+    'humorous': 'lighthearted',
+    'optimistic': 'uplifting',
+    'pessimistic': 'melancholic',
+    'formal': 'professional',
+    'informal': 'casual'
+}
 
 
 class ToneAnalyzer:
@@ -16,7 +36,49 @@ class ToneAnalyzer:
     def __init__(self):
         """Initialize the tone analyzer."""
         self.tone_patterns = self._initialize_tone_patterns()
-    
+        self.intensity_markers = _INTENSITY_MARKERS
+        self._tone_automaton = self._build_automaton(
+            keyword
+            for keywords in self.tone_patterns.values()
+            for keyword in keywords
+        )
+        self._intensity_automaton = self._build_automaton(self.intensity_markers)
+        # Shared all-zero scores dict for keyword-free texts, mirroring
+        # the sentiment analyzer's shared neutral result; returned by
+        # reference, like every cached result: read-only
+        self._zero_scores = dict.fromkeys(self.tone_patterns, 0.0)
+        # Repeated analyses of the same text return the memoized result
+        # instead of re-running the scoring passes
+        self._result_cache = TextResultCache(maxsize=128)
+
+    @staticmethod
+    def _build_automaton(words):
+        """
+        Build an Aho-Corasick automaton over a set of keywords.
+
+        One automaton pass over the text finds every keyword at once,
+        replacing one substring scan per keyword.
+
+        Args:
+            words: Iterable of keywords to index
+
+        Returns:
+            Automaton instance, or None when pyahocorasick is not
+            installed
+        """
+        try:
+            import ahocorasick
+        except ImportError:
+            # Fallback to per-keyword substring scanning if pyahocorasick not available
+            return None
+
+        automaton = ahocorasick.Automaton()
+        for word in words:
+            automaton.add_word(word, word)
+        automaton.make_automaton()
+        return automaton
+
+
     def _initialize_tone_patterns(self) -> Dict[str, List[str]]:
         """
         Initialize tone detection patterns.
@@ -48,11 +110,30 @@ class ToneAnalyzer:
             - mood: Overall mood descriptor
             - intensity: Intensity level (0.0 to 1.0)
         """
-        tone_scores = self._calculate_tone_scores(text)
-        primary_tone = max(tone_scores, key=tone_scores.get) if tone_scores else 'neutral'
-        
-        mood = self._detect_mood(text, tone_scores)
-        intensity = self._calculate_intensity(text)
+        return self._result_cache.get_or_compute(text, self._analyze_uncached)
+
+    def _analyze_uncached(self, text: str) -> Dict[str, Any]:
+        """
+        Run the tone and mood analysis for a cache miss.
+
+        Args:
+            text: Input text to analyze
+
+        Returns:
+            Analysis dictionary as documented on analyze()
+        """
+        # Lowercase once; the scoring and intensity passes share the copy
+        text_lower = text.lower()
+        tone_scores = self._calculate_tone_scores(text_lower)
+        if any(tone_scores.values()):
+            primary_tone = max(tone_scores, key=tone_scores.get)
+            mood = self._detect_mood(primary_tone)
+        else:
+            # All-zero scores are common for short texts; skip the
+            # max() scan and the mood lookup outright
+            primary_tone = 'neutral'
+            mood = 'neutral'
+        intensity = self._calculate_intensity(text_lower)
         
         return {
             'primary_tone': primary_tone,
@@ -61,81 +142,91 @@ class ToneAnalyzer:
             'intensity': intensity
         }
     
-    def _calculate_tone_scores(self, text: str) -> Dict[str, float]:
+    def _calculate_tone_scores(self, text_lower: str) -> Dict[str, float]:
         """
         Calculate confidence scores for each tone type.
-        
+
         Args:
-            text: Input text
-            
+            text_lower: Input text, already lowercased by the caller
+
         Returns:
             Dictionary mapping tone types to confidence scores
         """
-        text_lower = text.lower()
+        if self._tone_automaton is not None:
+            # One pass yields the distinct keywords present, so scores
+            # match the per-keyword presence checks
+            found = {keyword for _, keyword in self._tone_automaton.iter(text_lower)}
+            if not found:
+                return self._zero_scores
+            return {
+                tone: min(
+                    sum(1 for keyword in keywords if keyword in found)
+                    / max(len(keywords), 1),
+                    1.0
+                )
+                for tone, keywords in self.tone_patterns.items()
+            }
+
         scores = {}
-        
         for tone, keywords in self.tone_patterns.items():
             count = sum(1 for keyword in keywords if keyword in text_lower)
             scores[tone] = min(count / max(len(keywords), 1), 1.0)
-        
+
         return scores
     
-    def _detect_mood(self, text: str, tone_scores: Dict[str, float]) -> str:
+    def _detect_mood(self, primary_tone: str) -> str:
         """
-        Detect overall mood based on tone analysis.
-        
+        Detect overall mood from the primary tone.
+
         Args:
-            text: Input text
-            tone_scores: Calculated tone scores
-            
+            primary_tone: Primary tone already computed by the caller,
+                so the scores dict is not scanned a second time
+
         Returns:
             Mood descriptor
         """
-        mood_mapping = {
-            'dramatic': 'intense',
-            'serious': 'somber',
-            'humorous': 'lighthearted',
-            'optimistic': 'uplifting',
-            'pessimistic': 'melancholic',
-            'formal': 'professional',
-            'informal': 'casual'
-        }
-        
-        if tone_scores:
-            primary_tone = max(tone_scores, key=tone_scores.get)
-            return mood_mapping.get(primary_tone, 'neutral')
-        
-        return 'neutral'
+        return _MOOD_MAPPING.get(primary_tone, 'neutral')
     
-    def _calculate_intensity(self, text: str) -> float:
+    def _calculate_intensity(self, text_lower: str) -> float:
         """
         Calculate emotional intensity of the text.
-        
+
         Args:
-            text: Input text
-            
+            text_lower: Input text, already lowercased by the caller
+
         Returns:
             Intensity score (0.0 to 1.0)
         """
-        intensity_markers = [
-            '!', '?', 'very', 'extremely', 'absolutely', 'completely',
-            'totally', 'utterly', 'incredibly', 'amazingly'
-        ]
-        
-        text_lower = text.lower()
-        count = sum(1 for marker in intensity_markers if marker in text_lower)
-        
+        if self._intensity_automaton is not None:
+            count = len({
+                marker for _, marker in self._intensity_automaton.iter(text_lower)
+            })
+        else:
+            count = sum(
+                1 for marker in self.intensity_markers if marker in text_lower
+            )
+
         # Normalize to 0-1 range
         return min(count / 10.0, 1.0)
     
-    def analyze_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+    def analyze_batch(self, texts: List[str],
+                      max_workers: int = None) -> List[Dict[str, Any]]:
         """
         Analyze tone for multiple texts.
-        
+
+        The per-text scans are independent and the automaton and regex
+        passes release the GIL, so a thread pool overlaps them across
+        cores. Results keep the input order.
+
         Args:
             texts: List of texts to analyze
-            
+            max_workers: Thread count; defaults to the CPU count
+
         Returns:
             List of tone analysis results
         """
-        return [self.analyze(text) for text in texts]
+        if len(texts) < 2:
+            return [self.analyze(text) for text in texts]
+
+        with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            return list(executor.map(self.analyze, texts))